@@ -27,10 +27,11 @@ Run:
 import time
 import argparse
 import threading
-import queue
+import struct
 import serial
+from collections import defaultdict, deque
 from dataclasses import dataclass
-from typing import Dict, Optional, Tuple
+from typing import DefaultDict, Deque, Dict, Optional, Set, Tuple
 
 # --------------------------------------------------------------------------
 # Protocol constants
@@ -52,6 +53,9 @@ LCD_W = 128
 LCD_H = 64
 ROW_H = 8  # pixels per row
 
+# UI events handled per Tk tick before yielding back to the mainloop
+EVENTS_PER_TICK = 128
+
 # Your digit labels (visual only)
 DIGIT_FUNCS = {
     "1": "BAND",
@@ -85,11 +89,8 @@ KEYCODES: Dict[str, int] = {
 # --------------------------------------------------------------------------
 # Low-level encode / send (matches QuanshengDock.Comms.SendCommand2)
 # --------------------------------------------------------------------------
-def crypt(b: int, i: int) -> int:
-    return b ^ XOR_ARRAY[i & 0x0F]
-
-def crc16_byte(byt: int, crc: int) -> int:
-    crc ^= (byt << 8)
+def _crc16_table_entry(i: int) -> int:
+    crc = i << 8
     for _ in range(8):
         crc <<= 1
         if crc > 0xFFFF:
@@ -97,44 +98,79 @@ def crc16_byte(byt: int, crc: int) -> int:
             crc &= 0xFFFF
     return crc
 
-def send_command(ser: serial.Serial, cmd: int, payload: bytes = b"") -> None:
+# CRC16 (poly 0x1021, non-reflected), one entry per byte value
+CRC16_TABLE = tuple(_crc16_table_entry(i) for i in range(256))
+
+# XOR_ARRAY tiled and read as one little-endian int; covers frames up to 64 bytes
+_XOR_TILE_LEN = 64
+_XOR_TILE_INT = int.from_bytes(XOR_ARRAY * (_XOR_TILE_LEN // 16), "little")
+
+def _xor_key(n: int) -> int:
+    if n <= _XOR_TILE_LEN:
+        return _XOR_TILE_INT & ((1 << (8 * n)) - 1)
+    return int.from_bytes((XOR_ARRAY * (n // 16 + 1))[:n], "little")
+
+def _encode_frame(frame: bytearray, start: int, n: int) -> None:
+    """
+    In place: CRC16 over frame[start:start+n], store it (LSB first) right after,
+    then XOR-crypt those n+2 bytes as a single big-int XOR.
+    XOR_ARRAY has period 16 and the stream always starts at offset 0.
+    """
+    table = CRC16_TABLE
+    crc = 0
+    for bb in memoryview(frame)[start:start + n]:
+        crc = ((crc << 8) & 0xFFFF) ^ table[((crc >> 8) ^ bb) & 0xFF]
+    end = start + n
+    frame[end] = crc & 0xFF
+    frame[end + 1] = (crc >> 8) & 0xFF
+    m = n + 2
+    v = int.from_bytes(frame[start:start + m], "little") ^ _xor_key(m)
+    frame[start:start + m] = v.to_bytes(m, "little")
+
+_FRAME_HDR = struct.Struct("<HHH")  # enc_len, cmd, prm_len
+
+def build_frame(cmd: int, payload: bytes = b"") -> bytearray:
     """
     Frame:
       AB CD [len:u16] [xor(payload(cmd+prmlen+payload)+crc16)] DC BA
     CRC16 is computed over plain bytes (cmd + prmLen + payload), then the CRC bytes are XOR'd too.
     """
     prm_len = len(payload)
+    enc_len_field = 4 + prm_len  # cmd(2)+prmlen(2)+payload
 
-    plain = bytearray()
-    plain += cmd.to_bytes(2, "little")
-    plain += prm_len.to_bytes(2, "little")
-    plain += payload
-
-    crc = 0
-    for bb in plain:
-        crc = crc16_byte(bb, crc)
-
-    enc = bytearray()
-    for i, bb in enumerate(plain):
-        enc.append(crypt(bb, i))
+    # AB CD + len(2) + cmd(2) + prmlen(2) + payload + crc(2) + DC BA
+    frame = bytearray(2 + 2 + enc_len_field + 2 + 2)
+    frame[0] = 0xAB
+    frame[1] = 0xCD
+    _FRAME_HDR.pack_into(frame, 2, enc_len_field, cmd, prm_len)
+    frame[8:8 + prm_len] = payload
+    _encode_frame(frame, 4, enc_len_field)
+    frame[-2] = 0xDC
+    frame[-1] = 0xBA
+    return frame
 
-    xor_i = len(plain)
-    enc.append(crypt(crc & 0xFF, xor_i)); xor_i += 1
-    enc.append(crypt((crc >> 8) & 0xFF, xor_i))
+def send_command(ser: serial.Serial, cmd: int, payload: bytes = b"") -> None:
+    # write() already hands the frame to the OS; no per-frame drain
+    ser.write(build_frame(cmd, payload))
 
-    enc_len_field = 4 + prm_len  # cmd(2)+prmlen(2)+payload
+def build_keypress_frame(keycode: int) -> bytes:
+    return bytes(build_frame(PKT_KEYPRESS, int(keycode).to_bytes(2, "little")))
 
-    frame = bytearray()
-    frame += b"\xAB\xCD"
-    frame += enc_len_field.to_bytes(2, "little")
-    frame += enc
-    frame += b"\xDC\xBA"
+# Keypress frames never change, so encode each keycode once
+KEY_FRAMES: Dict[int, bytes] = {
+    kc: build_keypress_frame(kc)
+    for kc in (*KEYCODES.values(), DEFAULT_RELEASE_KEY, DEFAULT_PTT_HOLD, 13)
+}
 
-    ser.write(frame)
-    ser.flush()
+def keypress_frame(keycode: int) -> bytes:
+    keycode = int(keycode)
+    frame = KEY_FRAMES.get(keycode)
+    if frame is None:
+        frame = KEY_FRAMES[keycode] = build_keypress_frame(keycode)
+    return frame
 
 def send_keypress(ser: serial.Serial, keycode: int) -> None:
-    send_command(ser, PKT_KEYPRESS, int(keycode).to_bytes(2, "little"))
+    ser.write(keypress_frame(keycode))
 
 def press_for_ms(ser: serial.Serial, keycode: int, release_key: Optional[int], down_ms: int) -> None:
     send_keypress(ser, keycode)
@@ -142,9 +178,6 @@ def press_for_ms(ser: serial.Serial, keycode: int, release_key: Optional[int], d
         time.sleep(max(0, down_ms) / 1000.0)
         send_keypress(ser, release_key)
 
-def tap_key(ser: serial.Serial, keycode: int, release_key: Optional[int], down_ms: int = 60) -> None:
-    press_for_ms(ser, keycode, release_key, down_ms)
-
 # --------------------------------------------------------------------------
 # UI packet parser (0xB5...)
 # --------------------------------------------------------------------------
@@ -161,95 +194,114 @@ class Parser:
         self.v2 = 0
         self.v3 = 0
         self.ui_len = 0
-        self.ui_buf = bytearray()
+        self.ui_buf = bytearray()  # sized to ui_need at UI_LEN
+        self.ui_pos = 0
         self.ui_need = 0
         self.on_ui_packet = on_ui_packet
 
-    def feed(self, b: int):
-        s = self.stage
-
-        if s == self.IDLE:
-            if b == 0xAB:
-                self.stage = self.CD
-            elif b == 0xB5:
-                self.stage = self.UI_TYPE
-            return
-
-        # AB CD framed packet: ignore content (we only care about 0xB5 UI packets)
-        if s == self.CD:
-            self.stage = self.LEN_LSB if b == 0xCD else self.IDLE
-            return
-        if s == self.LEN_LSB:
-            self.p_len = b
-            self.stage = self.LEN_MSB
-            return
-        if s == self.LEN_MSB:
-            self.p_len |= (b << 8)
-            self.p_cnt = 0
-            self.stage = self.DATA
-            return
-        if s == self.DATA:
-            self.p_cnt += 1
-            if self.p_cnt >= self.p_len:
-                self.stage = self.CRC_LSB
-            return
-        if s == self.CRC_LSB:
-            self.stage = self.CRC_MSB
-            return
-        if s == self.CRC_MSB:
-            self.stage = self.DC
-            return
-        if s == self.DC:
-            self.stage = self.BA if b == 0xDC else self.IDLE
-            return
-        if s == self.BA:
-            self.stage = self.IDLE
-            return
+    def feed_bulk(self, buf) -> None:
+        """
+        Feed a whole serial chunk (bytes/memoryview).
+        The state lives in locals for the whole chunk and is written back
+        once at the end. Payload runs (AB/CD DATA, UI_DATA) are consumed as
+        slices; header bytes step through the stages one at a time.
+        """
+        # local aliases of the class stage constants
+        IDLE, CD, LEN_LSB, LEN_MSB = self.IDLE, self.CD, self.LEN_LSB, self.LEN_MSB
+        DATA, CRC_LSB, CRC_MSB, DC, BA = self.DATA, self.CRC_LSB, self.CRC_MSB, self.DC, self.BA
+        UI_TYPE, UI_V1, UI_V2, UI_V3 = self.UI_TYPE, self.UI_V1, self.UI_V2, self.UI_V3
+        UI_LEN, UI_DATA = self.UI_LEN, self.UI_DATA
+
+        emit = self.on_ui_packet
+        stage = self.stage
+        p_len, p_cnt = self.p_len, self.p_cnt
+        ui_type, v1, v2, v3 = self.ui_type, self.v1, self.v2, self.v3
+        ui_len, ui_need = self.ui_len, self.ui_need
+        ui_buf, ui_pos = self.ui_buf, self.ui_pos
+
+        n = len(buf)
+        i = 0
+        while i < n:
+            if stage == DATA:
+                # DATA always consumes at least one byte, even for p_len == 0
+                take = min(max(1, p_len - p_cnt), n - i)
+                p_cnt += take
+                i += take
+                if p_cnt >= p_len:
+                    stage = CRC_LSB
+                continue
+            if stage == UI_DATA:
+                take = min(ui_need - ui_pos, n - i)
+                ui_buf[ui_pos:ui_pos + take] = buf[i:i + take]
+                ui_pos += take
+                i += take
+                if ui_pos >= ui_need:
+                    emit(ui_type, v1, v2, v3, ui_len, bytes(ui_buf))
+                    stage = IDLE
+                continue
 
-        # UI packet
-        if s == self.UI_TYPE:
-            self.ui_type = b
-            self.stage = self.UI_V1
-            return
-        if s == self.UI_V1:
-            self.v1 = b
-            self.stage = self.UI_V2
-            return
-        if s == self.UI_V2:
-            self.v2 = b
-            self.stage = self.UI_V3
-            return
-        if s == self.UI_V3:
-            self.v3 = b
-            self.stage = self.UI_LEN
-            return
-        if s == self.UI_LEN:
-            self.ui_len = b
-            self.ui_buf.clear()
-            self.ui_need = 0 if self.ui_type == 6 else self.ui_len
-            if self.ui_need == 0:
-                self.on_ui_packet(self.ui_type, self.v1, self.v2, self.v3, self.ui_len, b"")
-                self.stage = self.IDLE
-            else:
-                self.stage = self.UI_DATA
-            return
-        if s == self.UI_DATA:
-            self.ui_buf.append(b)
-            if len(self.ui_buf) >= self.ui_need:
-                self.on_ui_packet(self.ui_type, self.v1, self.v2, self.v3, self.ui_len, bytes(self.ui_buf))
-                self.stage = self.IDLE
-            return
+            b = buf[i]
+            i += 1
+            if stage == IDLE:
+                if b == 0xAB:
+                    stage = CD
+                elif b == 0xB5:
+                    stage = UI_TYPE
+            elif stage == UI_TYPE:
+                ui_type = b
+                stage = UI_V1
+            elif stage == UI_V1:
+                v1 = b
+                stage = UI_V2
+            elif stage == UI_V2:
+                v2 = b
+                stage = UI_V3
+            elif stage == UI_V3:
+                v3 = b
+                stage = UI_LEN
+            elif stage == UI_LEN:
+                ui_len = b
+                ui_need = 0 if ui_type == 6 else ui_len
+                if ui_need == 0:
+                    emit(ui_type, v1, v2, v3, ui_len, b"")
+                    stage = IDLE
+                else:
+                    ui_buf = bytearray(ui_need)
+                    ui_pos = 0
+                    stage = UI_DATA
+            elif stage == CD:
+                stage = LEN_LSB if b == 0xCD else IDLE
+            elif stage == LEN_LSB:
+                p_len = b
+                stage = LEN_MSB
+            elif stage == LEN_MSB:
+                p_len |= (b << 8)
+                p_cnt = 0
+                stage = DATA
+            elif stage == CRC_LSB:
+                stage = CRC_MSB
+            elif stage == CRC_MSB:
+                stage = DC
+            elif stage == DC:
+                stage = BA if b == 0xDC else IDLE
+            else:  # BA
+                stage = IDLE
+
+        self.stage = stage
+        self.p_len, self.p_cnt = p_len, p_cnt
+        self.ui_type, self.v1, self.v2, self.v3 = ui_type, v1, v2, v3
+        self.ui_len, self.ui_need = ui_len, ui_need
+        self.ui_buf, self.ui_pos = ui_buf, ui_pos
 
 # --------------------------------------------------------------------------
 # UI helpers
 # --------------------------------------------------------------------------
 def ui_unpack_xy(v1: int, v2: int) -> Tuple[int, int]:
-    x = v1
-    row = v2
-    while x > 128:
-        row += 1
-        x -= 128
-    return x, row
+    # x wraps into the next row past 128 (128 itself stays on this row)
+    if v1 <= 128:
+        return v1, v2
+    q, r = divmod(v1 - 1, 128)
+    return r + 1, v2 + q
 
 def decode_battery(lenb: int) -> Tuple[float, float]:
     volts = min(lenb * 0.04, 8.4)
@@ -278,9 +330,16 @@ class LCDView:
         self._px_scale = 4.0
         self._off_x = 0.0
         self._off_y = 0.0
+        self._drawn_geom: Optional[Tuple[float, float, float]] = None  # (scale, off_x, off_y) of last redraw_all
 
-        self.buffer: Dict[str, DrawTextCmd] = {}
-        self._font_cache = {}
+        # row -> tag -> cmd, so CLEAR only touches the rows it names
+        self._by_row: DefaultDict[int, Dict[str, DrawTextCmd]] = defaultdict(dict)
+        self._tag_row: Dict[str, int] = {}
+        # tags changed since last flush_dirty(), in draw order (dict keeps
+        # insertion order, so overlapping cells stack as they arrived)
+        self._dirty: Dict[str, None] = {}
+        self._font_cache = {}     # point size -> Font
+        self._font_by_scale = {}  # cmd.scale -> Font at the current _px_scale
 
         import tkinter.font as tkfont
         self._tkfont = tkfont
@@ -291,20 +350,26 @@ class LCDView:
     def set_status(self, text: str) -> None:
         self.status_var.set(text)
 
-    def _calc_scale(self, w: int, h: int) -> None:
-        if w <= 1 or h <= 1:
-            return
+    def _geometry(self, w: int, h: int) -> Tuple[float, float, float]:
         scale = min(w / LCD_W, h / LCD_H)
         scale = max(1.0, scale)
+        return scale, (w - LCD_W * scale) / 2.0, (h - LCD_H * scale) / 2.0
 
+    def _calc_scale(self, w: int, h: int) -> None:
+        scale, self._off_x, self._off_y = self._geometry(w, h)
+        if scale == self._px_scale:
+            return
         self._px_scale = scale
-        self._off_x = (w - LCD_W * scale) / 2.0
-        self._off_y = (h - LCD_H * scale) / 2.0
 
         self.btn_font.configure(size=int(max(10, round(11.0 * (scale / 4.0)))))
-        self._font_cache.clear()
+        # point-size fonts stay valid; only the scale -> font mapping moves
+        self._font_by_scale.clear()
 
     def _on_resize(self, evt) -> None:
+        if evt.width <= 1 or evt.height <= 1:
+            return
+        if self._geometry(evt.width, evt.height) == self._drawn_geom:
+            return
         self._calc_scale(evt.width, evt.height)
         self.redraw_all()
 
@@ -312,10 +377,10 @@ class LCDView:
         return (self._off_x + x * self._px_scale, self._off_y + y * self._px_scale)
 
     def clear_lines(self, y1: int, y2: int) -> None:
-        kill = [tag for tag, cmd in self.buffer.items() if y1 <= cmd.row <= y2]
-        for tag in kill:
-            self.buffer.pop(tag, None)
         for r in range(y1, y2 + 1):
+            for tag in self._by_row.pop(r, ()):
+                self._tag_row.pop(tag, None)
+                self._dirty.pop(tag, None)
             self.canvas.delete(f"row_{r}")
 
     def _font(self, size: int):
@@ -325,20 +390,48 @@ class LCDView:
             self._font_cache[size] = f
         return f
 
+    def _font_for_scale(self, scale: float):
+        # built lazily on first use; v3 is one byte, so this stays bounded
+        f = self._font_by_scale.get(scale)
+        if f is None:
+            base = 10.0 * (self._px_scale / 4.0) * scale
+            f = self._font(int(max(6, round(base))))
+            self._font_by_scale[scale] = f
+        return f
+
     def draw_text(self, cmd: DrawTextCmd, tag_key: str) -> None:
-        self.buffer[tag_key] = cmd
-        self._draw_one(tag_key, cmd)
+        prev_row = self._tag_row.get(tag_key)
+        if prev_row is not None:
+            # same cell re-sent unchanged (every screen poll): nothing to do
+            if prev_row == cmd.row and self._by_row[prev_row].get(tag_key) == cmd:
+                return
+            if prev_row != cmd.row:
+                self._by_row[prev_row].pop(tag_key, None)
+        # canvas is only touched in flush_dirty(), once per poll cycle
+        self._by_row[cmd.row][tag_key] = cmd
+        self._tag_row[tag_key] = cmd.row
+        # re-queue at the end: the latest draw goes on top, as before batching
+        self._dirty.pop(tag_key, None)
+        self._dirty[tag_key] = None
 
     def delete_tag(self, tag_key: str) -> None:
-        self.buffer.pop(tag_key, None)
+        r = self._tag_row.pop(tag_key, None)
+        if r is not None:
+            self._by_row[r].pop(tag_key, None)
+        self._dirty.pop(tag_key, None)
         self.canvas.delete(tag_key)
 
+    def flush_dirty(self) -> None:
+        for tag in self._dirty:
+            r = self._tag_row.get(tag)
+            if r is not None:
+                self._draw_one(tag, self._by_row[r][tag])
+        self._dirty.clear()
+
     def _draw_one(self, tag_key: str, cmd: DrawTextCmd) -> None:
         self.canvas.delete(tag_key)
         xpx, ypx = self._px(cmd.x, cmd.row * ROW_H)
-        base = 10.0 * (self._px_scale / 4.0) * cmd.scale
-        size = int(max(6, round(base)))
-        font = self._font(size)
+        font = self._font_for_scale(cmd.scale)
 
         self.canvas.create_text(
             xpx, ypx,
@@ -351,13 +444,16 @@ class LCDView:
 
     def redraw_all(self) -> None:
         self.canvas.delete("all")
+        self._dirty.clear()
+        self._drawn_geom = (self._px_scale, self._off_x, self._off_y)
         if self.debug_grid:
             for r in range(0, 9):
                 x0, y0 = self._px(0, r * ROW_H)
                 x1, y1 = self._px(LCD_W, r * ROW_H)
                 self.canvas.create_line(x0, y0, x1, y1, fill="#222")
-        for tag, cmd in self.buffer.items():
-            self._draw_one(tag, cmd)
+        for row_cmds in self._by_row.values():
+            for tag, cmd in row_cmds.items():
+                self._draw_one(tag, cmd)
 
 # --------------------------------------------------------------------------
 # Main
@@ -378,13 +474,20 @@ def main():
     release_key: Optional[int] = None if args.release == -1 else args.release
     ptt_hold_key = int(args.ptt_hold)
     keydown_ms = max(10, int(args.keydown_ms))
+    # non-default --release/--ptt-hold: encode those up front too
+    for kc in (release_key, ptt_hold_key):
+        if kc is not None:
+            keypress_frame(kc)
 
-    q_events: "queue.Queue[tuple]" = queue.Queue()
+    # reader thread appends, Tk thread pops; deque append/popleft are atomic
+    q_events: Deque[tuple] = deque()
 
     def on_ui_packet(t: int, v1: int, v2: int, v3: int, data_len_byte: int, data: bytes):
-        q_events.put((t, v1, v2, v3, data_len_byte, data))
+        q_events.append((t, v1, v2, v3, data_len_byte, data))
 
     ser = serial.Serial(args.device, baudrate=args.baud, bytesize=8, parity="N", stopbits=1, timeout=0.2)
+    if hasattr(ser, "set_buffer_size"):  # Windows only
+        ser.set_buffer_size(rx_size=65536)
     print(f"Opened {args.device} @ {args.baud}. Ctrl+C to stop.")
     print("Keycodes: #/FN=47 (0x2F), digits 0..9=32..41.")
 
@@ -403,13 +506,15 @@ def main():
     def reader_thread():
         try:
             while not stop_flag.is_set():
-                chunk = ser.read(4096)
+                # take everything already buffered in one read; only block
+                # (up to the port timeout) when nothing is pending
+                pending = ser.in_waiting
+                chunk = ser.read(pending if pending else 1)
                 if not chunk:
                     continue
-                for b in chunk:
-                    parser.feed(b)
+                parser.feed_bulk(memoryview(chunk))
         except Exception as e:
-            q_events.put(("__ERR__", str(e)))
+            q_events.append(("__ERR__", str(e)))
         finally:
             try:
                 ser.close()
@@ -438,19 +543,20 @@ def main():
 
     # VFO derived from cursor rows
     vfo_state = {"which": "?"}
-    cursor_rows: Dict[int, int] = {}
+    cursor_style: Dict[int, int] = {}
+    active_cursor_rows: Set[int] = set()  # rows whose cursor style != 0
     last_cursor_row = {"row": None}
 
     def clear_cursor_rows(y1: int, y2: int) -> None:
-        dead = [r for r in cursor_rows.keys() if y1 <= r <= y2]
-        for r in dead:
-            view.delete_tag(f"cursor_{r}")
-            cursor_rows.pop(r, None)
+        for r in range(y1, y2 + 1):
+            if r in cursor_style:
+                view.delete_tag(f"cursor_{r}")
+                cursor_style.pop(r, None)
+                active_cursor_rows.discard(r)
 
     def derive_vfo_from_cursors() -> None:
-        active_rows = [r for r, st in cursor_rows.items() if st != 0]
-        if active_rows:
-            r = active_rows[0]
+        if active_cursor_rows:
+            r = min(active_cursor_rows)
         elif last_cursor_row["row"] is not None:
             r = last_cursor_row["row"]
         else:
@@ -462,21 +568,42 @@ def main():
         with send_lock:
             send_command(ser, PKT_GETSCREEN, b"")
 
+    # after() id of the release scheduled by the last do_key() tap
+    pending_release = {"id": None}
+
+    def send_release():
+        pending_release["id"] = None
+        if release_key is None:
+            return
+        with send_lock:
+            send_keypress(ser, release_key)
+
+    def finish_pending_release():
+        # keep down/release paired: release the previous tap before a new keydown
+        if pending_release["id"] is not None:
+            root.after_cancel(pending_release["id"])
+            send_release()
+
     def do_key(label: str, ms: int = None):
         if ms is None:
             ms = keydown_ms
+        finish_pending_release()
         with send_lock:
-            tap_key(ser, KEYCODES[label], release_key, down_ms=ms)
+            send_keypress(ser, KEYCODES[label])
+        # release from the Tk loop instead of sleeping on it
+        if release_key is not None:
+            pending_release["id"] = root.after(ms, send_release)
 
     def ptt_press():
+        finish_pending_release()
         with send_lock:
             send_keypress(ser, ptt_hold_key)
 
     def ptt_release():
-        if release_key is None:
-            return
-        with send_lock:
-            send_keypress(ser, release_key)
+        # one release covers both PTT and any pending tap
+        if pending_release["id"] is not None:
+            root.after_cancel(pending_release["id"])
+        send_release()
 
     # ---------------- Keypad layout ----------------
     pad = tk.Frame(root)
@@ -621,10 +748,12 @@ def main():
     last_freq_by_row: Dict[int, str] = {}
 
     def process_events():
-        while True:
+        # handle at most EVENTS_PER_TICK, then yield to Tk; come back as soon
+        # as it is idle if more are queued, else poll again in 20 ms
+        for _ in range(EVENTS_PER_TICK):
             try:
-                evt = q_events.get_nowait()
-            except queue.Empty:
+                evt = q_events.popleft()
+            except IndexError:
                 break
 
             if evt and evt[0] == "__ERR__":
@@ -650,7 +779,11 @@ def main():
             if ui_t == 7:  # CURSOR
                 row = int(v1)
                 style = int(v2)
-                cursor_rows[row] = style
+                cursor_style[row] = style
+                if style != 0:
+                    active_cursor_rows.add(row)
+                else:
+                    active_cursor_rows.discard(row)
                 last_cursor_row["row"] = row
                 glyph = "▻" if style == 0 else "➤"
                 view.draw_text(DrawTextCmd(x=0, row=row, scale=1.0, text=glyph), tag_key=f"cursor_{row}")
@@ -680,7 +813,13 @@ def main():
 
                 tag = f"cell_{ui_t}_{row}_{x}"
                 view.draw_text(DrawTextCmd(x=x, row=row, scale=scale, text=text), tag_key=tag)
+        else:
+            # hit the cap: more may be waiting
+            view.flush_dirty()
+            root.after_idle(process_events)
+            return
 
+        view.flush_dirty()
         root.after(20, process_events)
 
     root.after(20, process_events)